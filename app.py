@@ -1,84 +1,158 @@
 import streamlit as st
-import pandas as pd
+import queue
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
+from html import escape
 
 # ---------------------------
 # Page Config
 # ---------------------------
 st.set_page_config(page_title="AI Productivity Tracker", page_icon="✅", layout="centered")
 
-# Force dark mode look
-st.markdown(
-    """
-    <style>
-    body {
-        background-color: #0e1117;
-        color: #fafafa;
-    }
-    .stTextInput > div > div > input {
-        background-color: #262730;
-        color: white;
-    }
-    .stSelectbox div[data-baseweb="select"] > div {
-        background-color: #262730;
-        color: white;
-    }
-    .stDateInput > div > input {
-        background-color: #262730;
-        color: white;
-    }
-    .stButton > button {
-        background-color: #262730;
-        color: white;
-        border-radius: 8px;
-    }
-    .task-card {
-        padding: 15px;
-        margin: 8px 0;
-        border-radius: 8px;
-        background-color: #1e1e2f;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+# Dark theme colors live in .streamlit/config.toml; only the rules the theme
+# can't express are injected here.
+CSS = """
+<style>
+.stButton > button {
+    background-color: #262730;
+    color: white;
+    border-radius: 8px;
+}
+.task-card {
+    padding: 15px;
+    margin: 8px 0;
+    border-radius: 8px;
+    background-color: #1e1e2f;
+}
+</style>
+"""
+
+st.markdown(CSS, unsafe_allow_html=True)
 
 # ---------------------------
 # Database Setup
 # ---------------------------
-conn = sqlite3.connect("tasks.db", check_same_thread=False)
-c = conn.cursor()
-
-c.execute(
-    """CREATE TABLE IF NOT EXISTS tasks
-         (id INTEGER PRIMARY KEY AUTOINCREMENT,
-          task TEXT,
-          category TEXT,
-          priority TEXT,
-          due_date TEXT,
-          status TEXT)"""
-)
-conn.commit()
+DB_PATH = "tasks.db"
+POOL_SIZE = 4
+PAGE_SIZE = 20
+
+def init_db(conn):
+    conn.executescript(
+        """
+        BEGIN;
+        CREATE TABLE IF NOT EXISTS tasks
+             (id INTEGER PRIMARY KEY AUTOINCREMENT,
+              task TEXT,
+              category TEXT,
+              priority TEXT,
+              due_date TEXT,
+              status TEXT);
+        CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+        COMMIT;
+        """
+    )
+
+def open_conn():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-20000;
+        PRAGMA mmap_size=134217728;
+        """
+    )
+    return conn
+
+class SQLiteConnectionPool:
+    def __init__(self, size):
+        self._conns = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._conns.put(open_conn())
+
+    @contextmanager
+    def connection(self):
+        conn = self._conns.get()
+        try:
+            yield conn
+        finally:
+            # Never hand the next caller a connection holding an open transaction.
+            try:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            finally:
+                self._conns.put(conn)
+
+# One pool per server process: connections (and their page caches) outlive
+# reruns and sessions, and the schema is created once when the pool is built.
+@st.cache_resource
+def get_pool():
+    pool = SQLiteConnectionPool(POOL_SIZE)
+    with pool.connection() as conn:
+        init_db(conn)
+    return pool
+
+def connection():
+    return get_pool().connection()
+
+# Writes use BEGIN IMMEDIATE; multi-statement reads use BEGIN DEFERRED.
+@contextmanager
+def transaction(conn, mode="IMMEDIATE"):
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
 
 # ---------------------------
 # Helper Functions
 # ---------------------------
+# Process-wide version counter, bumped by every write, that keys the task cache.
+@st.cache_resource
+def _tasks_version():
+    return {"value": 0}
+
+def _bump_tasks_version():
+    _tasks_version()["value"] += 1
+
 def add_task(task, category, priority, due_date):
-    c.execute("INSERT INTO tasks (task, category, priority, due_date, status) VALUES (?, ?, ?, ?, ?)",
-              (task, category, priority, due_date, "Pending"))
-    conn.commit()
+    with connection() as conn, transaction(conn):
+        conn.execute("INSERT INTO tasks (task, category, priority, due_date, status) VALUES (?, ?, ?, ?, ?)",
+                     (task, category, priority, due_date, "Pending"))
+    _bump_tasks_version()
 
 def update_status(task_id, status):
-    c.execute("UPDATE tasks SET status=? WHERE id=?", (status, task_id))
-    conn.commit()
+    with connection() as conn, transaction(conn):
+        conn.execute("UPDATE tasks SET status=? WHERE id=?", (status, task_id))
+    _bump_tasks_version()
 
 def delete_task(task_id):
-    c.execute("DELETE FROM tasks WHERE id=?", (task_id,))
-    conn.commit()
+    with connection() as conn, transaction(conn):
+        conn.execute("DELETE FROM tasks WHERE id=?", (task_id,))
+    _bump_tasks_version()
 
-def get_tasks():
-    return pd.read_sql("SELECT * FROM tasks ORDER BY due_date", conn)
+# The total and the page of rows are read with one connection checkout inside
+# one read transaction, so the pager always matches the rows shown. Rows are
+# returned as plain dicts because st.cache_data pickles its results.
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def _load_page(version, page):
+    with connection() as conn, transaction(conn, "DEFERRED"):
+        total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        rows = conn.execute(
+            "SELECT id, task, category, priority, due_date, status FROM tasks "
+            "ORDER BY due_date, id LIMIT ? OFFSET ?",
+            (PAGE_SIZE, (page - 1) * PAGE_SIZE),
+        ).fetchall()
+    return total, [dict(row) for row in rows]
+
+def load_page(page=1):
+    return _load_page(_tasks_version()["value"], page)
 
 # ---------------------------
 # App Layout
@@ -99,36 +173,60 @@ with st.form("task_form", clear_on_submit=True):
         st.success(f"Task '{task}' added successfully! ✅")
 
 # --- Task List ---
-st.subheader("📋 Your Tasks")
-tasks_df = get_tasks()
-
-if not tasks_df.empty:
-    for _, row in tasks_df.iterrows():
-        with st.container():
-            st.markdown(
-                f"""
-                <div class="task-card">
-                <b>{row['task']}</b><br>
-                <small>
-                Category: {row['category']} | Priority: {row['priority']} | Due: {row['due_date']} | Status: {row['status']}
-                </small>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+# The action buttons write through on_click callbacks, which Streamlit runs
+# before the rerun their click triggers, so each action costs one rerun.
+def set_selected_status(status):
+    update_status(st.session_state.selected_task, status)
+
+def delete_selected():
+    delete_task(st.session_state.selected_task)
+    # Drop the deleted id so the selectbox falls back to the first task.
+    del st.session_state.selected_task
 
+# Task actions only rerun this fragment, not the page header or the add form.
+@st.fragment
+def render_tasks():
+    st.subheader("📋 Your Tasks")
+    page = st.session_state.get("task_page", 1)
+    total, tasks = load_page(page)
+    pages = max(1, -(-total // PAGE_SIZE))
+    if page > pages:
+        # Deletes emptied the page we were on; fall back to the new last page.
+        page = pages
+        total, tasks = load_page(page)
+
+    if total:
+        if pages > 1:
+            # Pinning the key keeps the widget on the loaded page when its
+            # max_value (and so its widget id) changes.
+            st.session_state.task_page = page
+            st.number_input("Page", min_value=1, max_value=pages, key="task_page")
+
+        # One markdown block for all cards; a single form drives the actions.
+        cards = "".join(
+            f'<div class="task-card"><b>{escape(row["task"])}</b> <small>#{row["id"]}</small><br><small>'
+            f'Category: {row["category"]} | Priority: {row["priority"]} | '
+            f'Due: {row["due_date"]} | Status: {row["status"]}'
+            "</small></div>"
+            for row in tasks
+        )
+        st.markdown(cards, unsafe_allow_html=True)
+
+        # Task names need not be unique, so the label carries the card's id too.
+        labels = {
+            row["id"]: f'{row["task"]} · due {row["due_date"]} · {row["status"]} · #{row["id"]}'
+            for row in tasks
+        }
+        with st.form("task_actions"):
+            st.selectbox("Task", list(labels), format_func=labels.get, key="selected_task")
             cols = st.columns([1, 1, 1])
             with cols[0]:
-                if st.button("✅ Done", key=f"done_{row['id']}"):
-                    update_status(row["id"], "Completed")
-                    st.rerun()
+                st.form_submit_button("✅ Done", on_click=set_selected_status, args=("Completed",))
             with cols[1]:
-                if st.button("⌛ Pending", key=f"pending_{row['id']}"):
-                    update_status(row["id"], "Pending")
-                    st.rerun()
+                st.form_submit_button("⌛ Pending", on_click=set_selected_status, args=("Pending",))
             with cols[2]:
-                if st.button("❌ Delete", key=f"delete_{row['id']}"):
-                    delete_task(row["id"])
-                    st.rerun()
-else:
-    st.info("No tasks yet. Add one above! 🚀")
+                st.form_submit_button("❌ Delete", on_click=delete_selected)
+    else:
+        st.info("No tasks yet. Add one above! 🚀")
+
+render_tasks()